@@ -1,7 +1,15 @@
 """Defines the Agent class for the generative DM package."""
+import math
+import re
+
 import networkx as nx
 
-from generativedm.pkg_utils.text_generation import generate, get_rating
+from generativedm.pkg_utils.text_generation import generate, generate_rating
+
+
+def _keywords(text):
+    """Return the set of lowercase words longer than three letters in a text."""
+    return {word for word in re.findall(r"\w+", text.lower()) if len(word) > 3}
 
 
 class Agent:
@@ -37,8 +45,14 @@ class Agent:
     compress_memories(memory_ratings, global_time, MEMORY_LIMIT=10):
         Compresses the agent's memories to a more manageable and relevant set.
 
-    rate_locations(locations, town_areas, global_time, prompt_meta):
+    candidate_locations(locations, popularity, total_agents, num_candidates=5, hops=2):
+        Shortlists the locations worth rating based on distance, plans and popularity.
+
+    rate_locations(locations, global_time, prompt_meta, candidates=None):
         Rates different locations in the simulated environment based on the agent's preferences and experiences.
+
+    choose_location(place_ratings, rng, temperature=1.0):
+        Picks the next location from the rated locations with a softmax over the ratings.
     """
 
     def __init__(self, name, description, starting_location, world_graph, llm_engine):
@@ -78,7 +92,9 @@ class Agent:
         prompt = "You are {}. The following is your description: {} You just woke up. What is your goal for today? Write it down in an hourly basis, starting at {}:00. Write only one or two very short sentences. Be very brief. Use at most 50 words.".format(
             self.name, self.description, str(global_time)
         )
-        self.plans = generate(prompt_meta.format(prompt), self.llm_engine)
+        self.plans = generate(
+            prompt_meta.format(prompt), self.llm_engine, call_type="plan"
+        )
 
     def execute_action(
         self, other_agents, location, global_time, town_areas, prompt_meta
@@ -124,7 +140,9 @@ class Agent:
         )
 
         prompt += "What do you do in the next hour? Use at most 10 words to explain."
-        action = generate(prompt_meta.format(prompt), self.llm_engine)
+        action = generate(
+            prompt_meta.format(prompt), self.llm_engine, call_type="action"
+        )
         return action
 
     def update_memories(self, other_agents, global_time, action_results):
@@ -198,20 +216,65 @@ class Agent:
                 str(global_time),
                 memory,
             )
-            res = generate(prompt_meta.format(prompt), self.llm_engine)
-            rating = get_rating(res)
-            max_attempts = 2
-            current_attempt = 0
-            while rating is None and current_attempt < max_attempts:
-                rating = get_rating(res)
-                current_attempt += 1
+            res, rating = generate_rating(
+                prompt_meta.format(prompt), self.llm_engine, call_type="rate_memories"
+            )
             if rating is None:
                 rating = 0
             memory_ratings.append((memory, rating, res))
         self.memory_ratings = memory_ratings
         return memory_ratings
 
-    def rate_locations(self, locations, global_time, prompt_meta):
+    def candidate_locations(
+        self, locations, popularity, total_agents, num_candidates=5, hops=2
+    ):
+        """
+        Shortlist the locations worth rating, so that only a few locations are rated per tick.
+
+        Only locations within ``hops`` steps in the world graph are considered. They are
+        scored by the number of words shared between the agent's plans and the location
+        name and description, plus their share of the agents and their closeness.
+
+        Parameters:
+        -----------
+        locations : Locations
+            The Locations object representing different areas in the simulated environment.
+        popularity : dict
+            The number of agents at each location.
+        total_agents : int
+            The number of agents in the simulation.
+        num_candidates : int, optional
+            The maximum number of locations to shortlist. Default is 5.
+        hops : int, optional
+            The maximum number of steps from the current location. Default is 2.
+
+        Returns:
+        --------
+        candidates : list
+            The Location objects to rate, best first.
+        """
+        distances = nx.single_source_shortest_path_length(
+            self.world_graph, self.location, cutoff=hops
+        )
+        plan_keywords = _keywords(self.plans)
+        total_agents = max(1, total_agents)
+
+        scored = []
+        for name, distance in distances.items():
+            location = locations.get_location(name)
+            if location is None:
+                continue
+            overlap = len(
+                plan_keywords & _keywords(f"{location.name} {location.description}")
+            )
+            score = (
+                overlap + popularity.get(name, 0) / total_agents + 1 / (1 + distance)
+            )
+            scored.append((score, location))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return [location for _, location in scored[:num_candidates]]
+
+    def rate_locations(self, locations, global_time, prompt_meta, candidates=None):
         """
         Rate different locations in the simulated environment based on the agent's preferences and experiences.
 
@@ -223,34 +286,62 @@ class Agent:
             The current time in the simulation.
         prompt_meta : str
             The prompt used to rate the locations.
+        candidates : list, optional
+            The Location objects to rate. Default is all the locations.
 
         Returns:
         --------
         place_ratings : list
             A list of tuples representing the location, its rating, and the generated response.
         """
+        if candidates is None:
+            candidates = locations.locations.values()
+
         place_ratings = []
-        for location in locations.locations.values():
-            prompt = "You are {}. Your plans are: {}. It is currently {}:00. You are currently at {}. How likely are you to go to {} next?".format(
+        for location in candidates:
+            prompt = "You are {}. Your plans are: {}. It is currently {}:00. You are currently at {}. How likely are you to go to {} next? Give a rating, between 1 and 5, to how likely you are to go there.".format(
                 self.name,
                 self.plans,
                 str(global_time),
                 locations.get_location(self.location),
                 location.name,
             )
-            res = generate(prompt_meta.format(prompt), self.llm_engine)
-            rating = get_rating(res)
-            max_attempts = 2
-            current_attempt = 0
-            while rating is None and current_attempt < max_attempts:
-                rating = get_rating(res)
-                current_attempt += 1
+            res, rating = generate_rating(
+                prompt_meta.format(prompt), self.llm_engine, call_type="rate_locations"
+            )
             if rating is None:
                 rating = 0
             place_ratings.append((location.name, rating, res))
         self.place_ratings = place_ratings
         return sorted(place_ratings, key=lambda x: x[1], reverse=True)
 
+    def choose_location(self, place_ratings, rng, temperature=1.0):
+        """
+        Pick the next location with a softmax over the location ratings.
+
+        Parameters:
+        -----------
+        place_ratings : list
+            A list of tuples representing the location, its rating, and the generated response.
+        rng : random.Random
+            The seeded random number generator used for the choice.
+        temperature : float, optional
+            Higher values make the choice more uniform. Default is 1.0.
+
+        Returns:
+        --------
+        location_name : str
+            The name of the chosen location.
+        """
+        if not place_ratings:
+            return self.location
+        max_rating = max(rating for _, rating, _ in place_ratings)
+        weights = [
+            math.exp((rating - max_rating) / temperature)
+            for _, rating, _ in place_ratings
+        ]
+        return rng.choices([name for name, _, _ in place_ratings], weights=weights)[0]
+
     def move(self, new_location_name):
         """Move the agent to a new location."""
         if new_location_name == self.location:
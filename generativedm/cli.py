@@ -6,7 +6,37 @@ from pathlib import Path
 import click
 
 import generativedm
+from generativedm.llm_engine import CALL_TYPES
 from generativedm.simulate import simulate
+from generativedm.synth_world import DISTRIBUTIONS, TOPOLOGIES, write_world
+
+
+def parse_routes(routes):
+    """Parse ``call_type=model,model`` route options into a dictionary.
+
+    Args:
+        routes (tuple): The ``--route`` option values.
+
+    Returns:
+        dict: The models for each call type, in escalation order.
+    """
+    parsed = {}
+    for route in routes:
+        call_type, sep, models = route.partition("=")
+        call_type = call_type.strip()
+        models = [m.strip() for m in models.split(",") if m.strip()]
+        if not sep or not models:
+            raise click.BadParameter(
+                f"Expected 'call_type=model[,model...]', got '{route}'",
+                param_hint="--route",
+            )
+        if call_type not in CALL_TYPES:
+            raise click.BadParameter(
+                f"Unknown call type '{call_type}', expected one of {CALL_TYPES}",
+                param_hint="--route",
+            )
+        parsed[call_type] = models
+    return parsed
 
 
 @click.group()
@@ -54,7 +84,46 @@ def version():
     help="Name of the text generation model",
     default="EleutherAI/gpt-j-6b",
 )
-def generate_world(config_file, simulation_days, use_openai, model_engine):
+@click.option(
+    "--route",
+    "routes",
+    multiple=True,
+    type=str,
+    help="Models for one call type in escalation order, e.g. "
+    "'rate_memories=google/flan-t5-small,declare-lab/flan-alpaca-xl'. "
+    "Use 'openai' for OpenAI's API. Can be repeated.",
+)
+@click.option(
+    "--num_candidates",
+    required=False,
+    type=click.IntRange(min=1),
+    help="The number of locations each agent rates before moving. Default is 5.",
+    default=5,
+)
+@click.option(
+    "--candidate_hops",
+    required=False,
+    type=click.IntRange(min=0),
+    help="The maximum distance of the rated locations in the world graph. Default is 2.",
+    default=2,
+)
+@click.option(
+    "--seed",
+    required=False,
+    type=int,
+    help="Seed for the choice of the next location. Default is 0.",
+    default=0,
+)
+def generate_world(
+    config_file,
+    simulation_days,
+    use_openai,
+    model_engine,
+    routes,
+    num_candidates,
+    candidate_hops,
+    seed,
+):
     """Execute the Phandalin demo."""
     logger = logging.getLogger(__name__)
     logger.info("Starting simulation...")
@@ -62,13 +131,83 @@ def generate_world(config_file, simulation_days, use_openai, model_engine):
     logger.info(f"Using simulation days: {simulation_days}")
     logger.info(f"Using OpenAI: {use_openai}")
     logger.info(f"Using model engine: {model_engine}")
+    logger.info(f"Using routes: {routes}")
+    logger.info(
+        f"Using {num_candidates} candidate locations within {candidate_hops} hops"
+    )
+    logger.info(f"Using seed: {seed}")
     simulate(
         config_file=config_file,
         simulation_days=simulation_days,
         use_openai=use_openai,
         model_engine=model_engine,
+        routes=parse_routes(routes),
+        num_candidates=num_candidates,
+        candidate_hops=candidate_hops,
+        seed=seed,
     )
 
 
+@cli.command()
+@click.option(
+    "--output_file",
+    required=False,
+    type=str,
+    help="Path to write the generated world configuration file",
+    default="config/synthetic_world_config.json",
+)
+@click.option(
+    "--num_agents",
+    required=False,
+    type=click.IntRange(min=0),
+    help="The number of people in the world. Default is 1000.",
+    default=1000,
+)
+@click.option(
+    "--num_areas",
+    required=False,
+    type=click.IntRange(min=1),
+    help="The number of areas in the world. Default is 100.",
+    default=100,
+)
+@click.option(
+    "--topology",
+    type=click.Choice(TOPOLOGIES),
+    default="ring",
+    help="How the areas are connected to each other",
+)
+@click.option(
+    "--distribution",
+    type=click.Choice(DISTRIBUTIONS),
+    default="uniform",
+    help="How the starting locations of the people are distributed",
+)
+@click.option(
+    "--seed",
+    required=False,
+    type=int,
+    help="Seed for the generated names, descriptions and locations. Default is 0.",
+    default=0,
+)
+def synth_world(output_file, num_agents, num_areas, topology, distribution, seed):
+    """Generate a synthetic world configuration for scale testing."""
+    logger = logging.getLogger(__name__)
+    logger.info(f"Generating synthetic world: {output_file}")
+    logger.info(f"Using {num_agents} agents and {num_areas} areas")
+    logger.info(f"Using topology: {topology}")
+    logger.info(f"Using distribution: {distribution}")
+    logger.info(f"Using seed: {seed}")
+    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w") as f:
+        write_world(
+            f,
+            num_agents=num_agents,
+            num_areas=num_areas,
+            topology=topology,
+            distribution=distribution,
+            seed=seed,
+        )
+
+
 if __name__ == "__main__":
     cli()
@@ -1,5 +1,27 @@
 """Dataclass to hold information about the LLM engine to use."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+CALL_TYPES = ["plan", "action", "rate_memories", "rate_locations", "summary"]
+
+
+@dataclass
+class RouteStats:
+    """Hold call statistics for one routed call type."""
+
+    calls: int = 0
+    escalations: int = 0
+    latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean latency per call in seconds."""
+        return self.latency / self.calls if self.calls else 0.0
+
+    @property
+    def escalation_rate(self) -> float:
+        """Fraction of calls that were escalated to a larger model."""
+        return self.escalations / self.calls if self.calls else 0.0
 
 
 @dataclass
@@ -8,18 +30,85 @@ class LLMEngine:
 
     use_openai: bool
     model_engine: str
+    routes: Dict[str, List["LLMEngine"]] = field(default_factory=dict)
+    stats: Dict[str, RouteStats] = field(default_factory=dict)
 
     def __init__(
-        self, use_openai: bool = False, model_engine: str = "declare-lab/flan-alpaca-xl"
+        self,
+        use_openai: bool = False,
+        model_engine: str = "declare-lab/flan-alpaca-xl",
+        routes: Optional[Dict[str, List[str]]] = None,
     ):
         """Initialize the LLMEngine dataclass.
 
         Args:
             use_openai (bool, optional): Whether to use OpenAI's API or not. Defaults to False.
             model_engine (str, optional): Name of the hugginface model to use. Defaults to "declare-lab/flan-alpaca-xl".
+            routes (Dict[str, List[str]], optional): Models to use for each call type, from the
+                cheapest to the most capable one. A call escalates to the next model when the
+                answer cannot be parsed or has low confidence. The model name "openai" uses
+                OpenAI's API. Call types without a route use this engine. Defaults to None.
         """
         self.use_openai = use_openai
         if self.use_openai:
-            model_engine = "text-davinci-002"  # ChatGPT4
+            self.model_engine = "text-davinci-002"  # ChatGPT4
         else:
             self.model_engine = model_engine
+
+        self.routes = {}
+        for call_type, model_engines in (routes or {}).items():
+            if call_type not in CALL_TYPES:
+                raise ValueError(
+                    f"Unknown call type '{call_type}', expected one of {CALL_TYPES}"
+                )
+            self.routes[call_type] = [
+                (
+                    LLMEngine(use_openai=True)
+                    if name == "openai"
+                    else LLMEngine(model_engine=name)
+                )
+                for name in model_engines
+            ]
+        self.stats = {}
+
+    def route(self, call_type: str) -> List["LLMEngine"]:
+        """Return the engines to try for a call type, in escalation order.
+
+        Args:
+            call_type (str): The type of the call, one of ``CALL_TYPES``.
+
+        Returns:
+            List[LLMEngine]: The engines to try in order.
+        """
+        return self.routes.get(call_type) or [self]
+
+    def record(self, call_type: str, latency: float, escalated: bool):
+        """Record the outcome of a routed call.
+
+        Args:
+            call_type (str): The type of the call, one of ``CALL_TYPES``.
+            latency (float): Total time spent on the call in seconds.
+            escalated (bool): Whether the call was escalated to a larger model.
+        """
+        stats = self.stats.setdefault(call_type, RouteStats())
+        stats.calls += 1
+        stats.escalations += int(escalated)
+        stats.latency += latency
+
+    def report(self) -> str:
+        """Summarize the call count, latency and escalation rate of every route.
+
+        Returns:
+            str: One line per call type.
+        """
+        lines = []
+        for call_type, stats in self.stats.items():
+            models = " -> ".join(
+                engine.model_engine for engine in self.route(call_type)
+            )
+            lines.append(
+                f"{call_type} [{models}]: {stats.calls} calls, "
+                f"{stats.mean_latency:.2f}s mean latency, "
+                f"{stats.escalation_rate:.0%} escalated"
+            )
+        return "\n".join(lines)
@@ -1,11 +1,12 @@
 """Text interaction with OpenAI API and Hugging Face models.""" ""
 import os
 import re
+import time
+from functools import lru_cache
 
 import openai
-import torch
 from dotenv import load_dotenv
-from transformers import pipeline
+from transformers import AutoConfig, pipeline
 
 # Load environment variables from .env file
 load_dotenv("config/.env")
@@ -14,13 +15,37 @@ load_dotenv("config/.env")
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
 
-def generate(prompt, llm_engine):
+@lru_cache(maxsize=None)
+def hf_pipeline(model_engine):
+    """
+    Load a Hugging Face text generation pipeline once per model.
+
+    Encoder-decoder models such as T5 use a text2text pipeline, other models a causal one.
+
+    Args:
+    - model_engine (str): Name of the Hugging Face model.
+
+    Returns:
+    - Pipeline: The text generation pipeline.
+    """
+    # torch is an optional extra, only needed for local inference
+    import torch
+
+    torch_device = "cuda" if torch.cuda.is_available() else "cpu"
+    if AutoConfig.from_pretrained(model_engine).is_encoder_decoder:
+        task = "text2text-generation"
+    else:
+        task = "text-generation"
+    return pipeline(task, model=model_engine, device=torch_device)
+
+
+def complete(prompt, llm_engine):
     """
     Generate a text completion for a given prompt using either the OpenAI GPT-3 API or the Hugging Face GPT-3 model.
 
     Args:
     - prompt (str): The text prompt to generate a completion for.
-    - llm_engine (LLMEngine): A boolean flag indicating whether to use the OpenAI API (True) or the Hugging Face GPT-3 model (False).
+    - llm_engine (LLMEngine): The engine to run the prompt on, ignoring its routes.
 
     Returns:
     - str: The generated text completion.
@@ -39,10 +64,7 @@ def generate(prompt, llm_engine):
         return message.strip()
 
     else:
-        torch_device = "cuda" if torch.cuda.is_available() else "cpu"
-        hf_generator = pipeline(
-            "text-generation", model=llm_engine.model_engine, device=torch_device
-        )
+        hf_generator = hf_pipeline(llm_engine.model_engine)
         output = hf_generator(prompt, max_length=len(prompt) + 128, do_sample=True)
         out = output[0]["generated_text"]
         if "### Response:" in out:
@@ -52,6 +74,68 @@ def generate(prompt, llm_engine):
         return out.strip()
 
 
+def cascade(prompt, llm_engine, call_type, parse):
+    """
+    Run a prompt through the engines routed for a call type, escalating until the answer can be parsed.
+
+    Args:
+    - prompt (str): The text prompt to generate a completion for.
+    - llm_engine (LLMEngine): The engine holding the routes and the call statistics.
+    - call_type (str): The type of the call, used to pick the route.
+    - parse (callable): Returns the parsed answer, or None when it is unusable or has low confidence.
+
+    Returns:
+    - tuple: The last generated text completion and its parsed value (None if no engine succeeded).
+    """
+    engines = llm_engine.route(call_type)
+    start = time.perf_counter()
+    for level, engine in enumerate(engines):
+        res = complete(prompt, engine)
+        value = parse(res)
+        if value is not None:
+            break
+    llm_engine.record(call_type, time.perf_counter() - start, escalated=level > 0)
+    return res, value
+
+
+def generate(prompt, llm_engine, call_type):
+    """
+    Generate a text completion for a given prompt, escalating to the next routed model on an empty answer.
+
+    Args:
+    - prompt (str): The text prompt to generate a completion for.
+    - llm_engine (LLMEngine): The engine to use, with optional routes per call type.
+    - call_type (str): The type of the call, used to pick the route.
+
+    Returns:
+    - str: The generated text completion.
+    """
+    res, _ = cascade(prompt, llm_engine, call_type, lambda x: x or None)
+    return res
+
+
+def generate_rating(prompt, llm_engine, call_type, low=1, high=5):
+    """
+    Generate a rating for a given prompt, escalating to the next routed model on a low confidence answer.
+
+    Args:
+    - prompt (str): The text prompt asking for a rating.
+    - llm_engine (LLMEngine): The engine to use, with optional routes per call type.
+    - call_type (str): The type of the call, used to pick the route.
+    - low (int): The lowest valid rating.
+    - high (int): The highest valid rating.
+
+    Returns:
+    - tuple: The generated text and the rating, or None if no rating within [low, high] is found.
+    """
+    res, rating = cascade(
+        prompt, llm_engine, call_type, lambda x: get_confident_rating(x, low, high)
+    )
+    if rating is None:
+        rating = get_lenient_rating(res, low, high)
+    return res, rating
+
+
 def get_rating(x):
     """
     Extract a rating from a string.
@@ -69,16 +153,71 @@ def get_rating(x):
         return None
 
 
+def strip_scale(x):
+    """
+    Remove the rating scale from a string, so that only the rating itself is left.
+
+    Args:
+    - x (str): The string to clean.
+
+    Returns:
+    - str: The string without phrases such as "between 1 and 5", "1 to 5", "1-5", "/5", "out of 5" or "of 5".
+    """
+    x = re.sub(r"\bbetween\s+\d+\s+and\s+\d+", "", x, flags=re.IGNORECASE)
+    x = re.sub(r"\b\d+\s*(?:-|\bto\b)\s*\d+\b", "", x, flags=re.IGNORECASE)
+    return re.sub(r"\s*(?:/|\bout of\b|\bof\b)\s*\d+", "", x, flags=re.IGNORECASE)
+
+
+def get_lenient_rating(x, low=1, high=5):
+    """
+    Extract the first rating within range from a string, ignoring the rating scale.
+
+    Args:
+    - x (str): The string to extract the rating from.
+    - low (int): The lowest valid rating.
+    - high (int): The highest valid rating.
+
+    Returns:
+    - int: The first number within [low, high], or None if there is none.
+    """
+    for num in re.findall(r"\d+", strip_scale(x)):
+        if low <= int(num) <= high:
+            return int(num)
+    return None
+
+
+def get_confident_rating(x, low=1, high=5):
+    """
+    Extract a rating from a string only when it is unambiguous.
+
+    Args:
+    - x (str): The string to extract the rating from.
+    - low (int): The lowest valid rating.
+    - high (int): The highest valid rating.
+
+    Returns:
+    - int: The rating if the string holds exactly one distinct number within [low, high], or None otherwise.
+      The rating scale, e.g. "4/5" or "between 1 and 5", is ignored.
+    """
+    nums = set(int(i) for i in re.findall(r"\d+", strip_scale(x)))
+    if len(nums) == 1:
+        rating = nums.pop()
+        if low <= rating <= high:
+            return rating
+    return None
+
+
 # Summarize simulation loop with OpenAI GPT-4
-def summarize_simulation(log_output):
+def summarize_simulation(log_output, llm_engine):
     """Summarize the simulation loop.
 
     Args:
         log_output (str): The log output to summarize.
+        llm_engine (LLMEngine): The engine to use for the summary.
 
     Returns:
         str: The summary of the simulation loop.
     """
     prompt = f"Summarize the simulation loop:\n\n{log_output}"
-    response = generate(prompt)
+    response = generate(prompt, llm_engine, call_type="summary")
     return response
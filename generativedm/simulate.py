@@ -1,6 +1,9 @@
 """Simulation Engine."""
 import json
 import logging
+import random
+from collections import Counter
+from typing import Dict, List, Optional
 
 import networkx as nx
 
@@ -12,11 +15,64 @@ from generativedm.pkg_utils.text_generation import summarize_simulation
 logger = logging.getLogger(__name__)
 
 
+def load_world(config_file: str):
+    """Load a world configuration and build its graph.
+
+    The areas are connected according to the optional ``town_graph`` edge list
+    (as written by ``generativedm synth-world``). When it is missing, the areas
+    are connected in a ring following their order in ``town_areas``.
+
+    Args:
+        config_file (str): Path to the configuration file for the world initialization.
+
+    Returns:
+        tuple: The ``town_areas`` and ``town_people`` dictionaries and the world graph.
+
+    Raises:
+        ValueError: If an edge in ``town_graph`` does not connect two ``town_areas``.
+    """
+    logger.info(f"Loading config file: {config_file}")
+    with open(config_file, "r") as f:
+        town_data = json.load(f)
+
+    town_people = town_data["town_people"]
+    town_areas = town_data["town_areas"]
+
+    # Create world_graph
+    logger.info("Creating world graph...")
+    world_graph = nx.Graph()
+    world_graph.add_nodes_from(town_areas)
+    # Add an edge from every area to itself
+    world_graph.add_edges_from((town_area, town_area) for town_area in town_areas)
+    if "town_graph" in town_data:
+        for edge in town_data["town_graph"]:
+            if len(edge) != 2 or any(area not in town_areas for area in edge):
+                raise ValueError(
+                    f"Edge {edge} in town_graph does not connect two town_areas"
+                )
+        world_graph.add_edges_from(town_data["town_graph"])
+    else:
+        # Connect consecutive town areas and close the cycle
+        areas = iter(town_areas)
+        first_town_area = last_town_area = next(areas, None)
+        for town_area in areas:
+            world_graph.add_edge(town_area, last_town_area)
+            last_town_area = town_area
+        if first_town_area is not None:
+            world_graph.add_edge(first_town_area, last_town_area)
+
+    return town_areas, town_people, world_graph
+
+
 def simulate(
     config_file: str,
     simulation_days: int = 10,
     use_openai: bool = False,
     model_engine: str = "declare-lab/flan-alpaca-xl",
+    routes: Optional[Dict[str, List[str]]] = None,
+    num_candidates: int = 5,
+    candidate_hops: int = 2,
+    seed: int = 0,
 ):
     """Simulate NPCs.
 
@@ -25,6 +81,10 @@ def simulate(
         simulation_days (int, optional): Number of days to simulate. Defaults to 10.
         use_openai (bool, optional): Whether to use OpenAI or not. Defaults to False.
         model_engine (str, optional): Hugging Face text generation model name. Defaults to "declare-lab/flan-alpaca-xl".
+        routes (Dict[str, List[str]], optional): Models to use for each call type, in escalation order. Defaults to None.
+        num_candidates (int, optional): Number of locations each agent rates before moving. Defaults to 5.
+        candidate_hops (int, optional): Maximum distance in the world graph of the rated locations. Defaults to 2.
+        seed (int, optional): Seed for the choice of the next location. Defaults to 0.
     """
     # Set default value for prompt_meta if not defined elsewhere
     prompt_meta = "### Instruction:\n{}\n### Response:"
@@ -38,32 +98,17 @@ def simulate(
     log_ratings = True
     log_memories = True
 
-    llm_engine = LLMEngine(use_openai=use_openai, model_engine=model_engine)
+    llm_engine = LLMEngine(
+        use_openai=use_openai, model_engine=model_engine, routes=routes
+    )
+
+    rng = random.Random(seed)
 
     # Start simulation loop
     whole_simulation_output = ""
 
     # Load town areas and people from JSON file
-    logger.info(f"Loading config file: {config_file}")
-    with open(config_file, "r") as f:
-        town_data = json.load(f)
-
-    town_people = town_data["town_people"]
-    town_areas = town_data["town_areas"]
-
-    # Create world_graph
-    logger.info("Creating world graph...")
-    world_graph = nx.Graph()
-    last_town_area = None
-    for town_area in town_areas.keys():
-        world_graph.add_node(town_area)
-        world_graph.add_edge(town_area, town_area)  # Add an edge to itself
-        if last_town_area is not None:
-            world_graph.add_edge(town_area, last_town_area)
-        last_town_area = town_area
-
-    # Add the edge between the first and the last town areas to complete the cycle
-    world_graph.add_edge(list(town_areas.keys())[0], last_town_area)
+    town_areas, town_people, world_graph = load_world(config_file)
 
     # Initialize agents and locations
     logger.info("Initializing agents and locations...")
@@ -146,9 +191,15 @@ def simulate(
                     )
                     logger.info(f"{agent.name} memory ratings: {agent.memory_ratings}")
 
-        # Rate locations and determine where agents will go next
+        # Rate nearby locations and determine where agents will go next
+        popularity = Counter(agent.location for agent in agents)
         for agent in agents:
-            place_ratings = agent.rate_locations(locations, global_time, prompt_meta)
+            candidates = agent.candidate_locations(
+                locations, popularity, len(agents), num_candidates, candidate_hops
+            )
+            place_ratings = agent.rate_locations(
+                locations, global_time, prompt_meta, candidates
+            )
             if log_ratings:
                 log_output += (
                     f"=== UPDATED LOCATION RATINGS {global_time} FOR {agent.name}===\n"
@@ -161,8 +212,10 @@ def simulate(
 
             old_location = agent.location
 
-            new_location_name = place_ratings[0][0]
+            new_location_name = agent.choose_location(place_ratings, rng)
             agent.move(new_location_name)
+            popularity[old_location] -= 1
+            popularity[agent.location] += 1
 
             if log_locations:
                 log_output += (
@@ -182,7 +235,8 @@ def simulate(
             f"----------------------- SUMMARY FOR simulation_day {simulation_day} -----------------------"
         )
 
-        logger.info(summarize_simulation(log_output=log_output))
+        logger.info(summarize_simulation(log_output=log_output, llm_engine=llm_engine))
+        logger.info(f"LLM call statistics:\n{llm_engine.report()}")
 
         whole_simulation_output += log_output
 
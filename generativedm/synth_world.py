@@ -0,0 +1,352 @@
+"""Synthetic world generator for scale testing.
+
+Generates world configuration files in the same ``town_areas``/``town_people``
+schema as ``config/simulation_config.json``, plus an optional ``town_graph``
+edge list describing how the areas are connected. People are streamed to disk
+one entry at a time so that very large populations never have to be held in
+memory.
+"""
+import json
+import math
+import random
+from itertools import accumulate
+from typing import Iterator, List, TextIO, Tuple
+
+TOPOLOGIES = ["ring", "grid", "small-world", "clustered"]
+DISTRIBUTIONS = ["uniform", "zipf", "clustered"]
+
+DEFAULT_GENERAL = {
+    "global_time_limit": 24,
+    "max_attempts": 2,
+    "memory_limit": 10,
+    "prompt_meta": "### Instruction:\n{}\n### Response:",
+}
+
+_AREA_ADJECTIVES = [
+    "Old",
+    "Mossy",
+    "Gilded",
+    "Quiet",
+    "Crooked",
+    "Sunlit",
+    "Broken",
+    "Misty",
+    "Iron",
+    "Silver",
+]
+_AREA_NOUNS = [
+    "Inn",
+    "Market",
+    "Chapel",
+    "Orchard",
+    "Forge",
+    "Mill",
+    "Square",
+    "Docks",
+    "Library",
+    "Barracks",
+]
+_AREA_DETAILS = [
+    "Locals gather here to trade gossip.",
+    "The smell of smoke and bread hangs in the air.",
+    "A few guards keep a wary eye on strangers.",
+    "It is busiest around midday.",
+    "Travellers often stop here to rest.",
+    "The place has seen better days.",
+]
+_FIRST_NAMES = [
+    "Toblen",
+    "Daran",
+    "Linene",
+    "Halia",
+    "Elmar",
+    "Qelline",
+    "Sildar",
+    "Harbin",
+    "Nundro",
+    "Mirna",
+]
+_LAST_NAMES = [
+    "Stonehill",
+    "Edermath",
+    "Graywind",
+    "Thornton",
+    "Barthen",
+    "Alderleaf",
+    "Hallwinter",
+    "Wester",
+    "Rockseeker",
+    "Dendrar",
+]
+_PROFESSIONS = [
+    "blacksmith",
+    "farmer",
+    "merchant",
+    "priest",
+    "guard",
+    "innkeeper",
+    "miner",
+    "scholar",
+    "hunter",
+    "retired adventurer",
+]
+_TRAITS = [
+    "cheerful",
+    "suspicious",
+    "ambitious",
+    "quiet",
+    "curious",
+    "stubborn",
+    "generous",
+    "calculating",
+]
+
+
+def area_names(num_areas: int, rng: random.Random) -> List[str]:
+    """Generate unique, seeded area names.
+
+    Args:
+        num_areas (int): Number of areas to name.
+        rng (random.Random): Seeded random number generator.
+
+    Returns:
+        List[str]: The area names, indexed by area id.
+    """
+    return [
+        f"{rng.choice(_AREA_ADJECTIVES)} {rng.choice(_AREA_NOUNS)} {i}"
+        for i in range(num_areas)
+    ]
+
+
+def area_description(name: str, rng: random.Random) -> str:
+    """Generate a seeded description for an area.
+
+    Args:
+        name (str): Name of the area.
+        rng (random.Random): Seeded random number generator.
+
+    Returns:
+        str: The area description.
+    """
+    return f"{name}. {rng.choice(_AREA_DETAILS)}"
+
+
+def person_name(index: int, rng: random.Random) -> str:
+    """Generate a unique, seeded person name.
+
+    Args:
+        index (int): Index of the person, used to keep names unique.
+        rng (random.Random): Seeded random number generator.
+
+    Returns:
+        str: The person name.
+    """
+    return f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)} {index}"
+
+
+def person_description(name: str, rng: random.Random) -> str:
+    """Generate a seeded description for a person.
+
+    Args:
+        name (str): Name of the person.
+        rng (random.Random): Seeded random number generator.
+
+    Returns:
+        str: The person description.
+    """
+    trait = rng.choice(_TRAITS)
+    article = "an" if trait[0] in "aeiou" else "a"
+    return f"{name} is {article} {trait} {rng.choice(_PROFESSIONS)}."
+
+
+def ring_edges(num_areas: int) -> Iterator[Tuple[int, int]]:
+    """Yield the edges of a ring connecting every area to the next one.
+
+    Args:
+        num_areas (int): Number of areas.
+
+    Yields:
+        Tuple[int, int]: Pairs of area indices.
+    """
+    if num_areas < 2:
+        return
+    for i in range(num_areas - 1):
+        yield i, i + 1
+    if num_areas > 2:
+        yield num_areas - 1, 0
+
+
+def grid_edges(num_areas: int) -> Iterator[Tuple[int, int]]:
+    """Yield the edges of an (almost) square grid of areas.
+
+    Args:
+        num_areas (int): Number of areas.
+
+    Yields:
+        Tuple[int, int]: Pairs of area indices.
+    """
+    width = max(1, math.ceil(math.sqrt(num_areas)))
+    for i in range(num_areas):
+        if (i + 1) % width != 0 and i + 1 < num_areas:
+            yield i, i + 1
+        if i + width < num_areas:
+            yield i, i + width
+
+
+def small_world_edges(
+    num_areas: int, rng: random.Random, neighbors: int = 4, rewire_prob: float = 0.1
+) -> Iterator[Tuple[int, int]]:
+    """Yield the edges of a Watts-Strogatz style small-world graph.
+
+    The underlying ring is always kept so that the graph stays connected; only
+    the longer lattice edges are rewired.
+
+    Args:
+        num_areas (int): Number of areas.
+        rng (random.Random): Seeded random number generator.
+        neighbors (int, optional): Lattice neighbors per area. Defaults to 4.
+        rewire_prob (float, optional): Probability to rewire a lattice edge. Defaults to 0.1.
+
+    Yields:
+        Tuple[int, int]: Pairs of area indices.
+    """
+    yield from ring_edges(num_areas)
+    for offset in range(2, neighbors // 2 + 1):
+        if offset >= num_areas - 1:
+            break
+        for i in range(num_areas):
+            j = (i + offset) % num_areas
+            if rng.random() < rewire_prob:
+                j = rng.randrange(num_areas)
+                if j == i:
+                    continue
+            yield i, j
+
+
+def clustered_edges(num_areas: int, cluster_size: int = 8) -> Iterator[Tuple[int, int]]:
+    """Yield the edges of densely connected clusters joined in a ring.
+
+    Args:
+        num_areas (int): Number of areas.
+        cluster_size (int, optional): Number of areas per cluster. Defaults to 8.
+
+    Yields:
+        Tuple[int, int]: Pairs of area indices.
+    """
+    starts = list(range(0, num_areas, cluster_size))
+    for start in starts:
+        members = range(start, min(start + cluster_size, num_areas))
+        for i in members:
+            for j in members:
+                if i < j:
+                    yield i, j
+    for k in range(len(starts) - 1):
+        yield starts[k], starts[k + 1]
+    if len(starts) > 2:
+        yield starts[-1], starts[0]
+
+
+def topology_edges(
+    topology: str, num_areas: int, rng: random.Random
+) -> Iterator[Tuple[int, int]]:
+    """Yield the edges for the requested topology.
+
+    Args:
+        topology (str): One of ``TOPOLOGIES``.
+        num_areas (int): Number of areas.
+        rng (random.Random): Seeded random number generator.
+
+    Yields:
+        Tuple[int, int]: Pairs of area indices.
+    """
+    if topology == "ring":
+        return ring_edges(num_areas)
+    if topology == "grid":
+        return grid_edges(num_areas)
+    if topology == "small-world":
+        return small_world_edges(num_areas, rng)
+    if topology == "clustered":
+        return clustered_edges(num_areas)
+    raise ValueError(f"Unknown topology '{topology}', expected one of {TOPOLOGIES}")
+
+
+def location_weights(distribution: str, num_areas: int) -> List[float]:
+    """Build cumulative weights for sampling starting locations.
+
+    Args:
+        distribution (str): One of ``DISTRIBUTIONS``.
+        num_areas (int): Number of areas.
+
+    Returns:
+        List[float]: Cumulative weights, indexed by area id.
+    """
+    if distribution == "uniform":
+        weights = [1.0] * num_areas
+    elif distribution == "zipf":
+        weights = [1.0 / (i + 1) for i in range(num_areas)]
+    elif distribution == "clustered":
+        # Crowd everyone into the first tenth of the map.
+        hot = max(1, num_areas // 10)
+        weights = [1.0 if i < hot else 0.0 for i in range(num_areas)]
+    else:
+        raise ValueError(
+            f"Unknown distribution '{distribution}', expected one of {DISTRIBUTIONS}"
+        )
+    return list(accumulate(weights))
+
+
+def write_world(
+    stream: TextIO,
+    num_agents: int,
+    num_areas: int,
+    topology: str = "ring",
+    distribution: str = "uniform",
+    seed: int = 0,
+):
+    """Stream a synthetic world configuration as JSON.
+
+    Args:
+        stream (TextIO): Writable text stream.
+        num_agents (int): Number of people in the world.
+        num_areas (int): Number of areas in the world.
+        topology (str, optional): Area graph topology. Defaults to "ring".
+        distribution (str, optional): Starting location distribution. Defaults to "uniform".
+        seed (int, optional): Seed for names, descriptions and placement. Defaults to 0.
+    """
+    if num_areas < 1:
+        raise ValueError("A world needs at least one area")
+    rng = random.Random(seed)
+    names = area_names(num_areas, rng)
+    cum_weights = location_weights(distribution, num_areas)
+    edges = topology_edges(topology, num_areas, rng)
+
+    stream.write('{\n  "general": ')
+    stream.write(json.dumps(DEFAULT_GENERAL))
+
+    stream.write(',\n  "town_areas": {')
+    for i, name in enumerate(names):
+        separator = "," if i else ""
+        stream.write(
+            f"{separator}\n    {json.dumps(name)}: "
+            f"{json.dumps(area_description(name, rng))}"
+        )
+    stream.write("\n  }")
+
+    stream.write(',\n  "town_graph": [')
+    for k, (i, j) in enumerate(edges):
+        separator = "," if k else ""
+        stream.write(f"{separator}\n    {json.dumps([names[i], names[j]])}")
+    stream.write("\n  ]")
+
+    stream.write(',\n  "town_people": {')
+    for i in range(num_agents):
+        name = person_name(i, rng)
+        person = {
+            "description": person_description(name, rng),
+            "starting_location": names[
+                rng.choices(range(num_areas), cum_weights=cum_weights)[0]
+            ],
+        }
+        separator = "," if i else ""
+        stream.write(f"{separator}\n    {json.dumps(name)}: {json.dumps(person)}")
+    stream.write("\n  }\n}\n")
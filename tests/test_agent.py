@@ -0,0 +1,108 @@
+"""Tests for the location shortlist and choice of the agents."""
+import random
+
+import networkx as nx
+import pytest
+
+from generativedm.agent import Agent
+from generativedm.locations import Locations
+
+
+@pytest.fixture
+def locations():
+    """Areas on a star around the Square, with the Forge one step further."""
+    locations = Locations()
+    locations.add_location("Square", "The town square.")
+    locations.add_location("Inn", "A busy inn.")
+    locations.add_location("Mill", "An old mill.")
+    locations.add_location("Chapel", "A quiet chapel.")
+    locations.add_location("Forge", "The smithy, where swords are forged.")
+    return locations
+
+
+@pytest.fixture
+def agent():
+    """An agent at the Square, next to an area missing from the locations."""
+    world_graph = nx.Graph()
+    world_graph.add_edges_from(
+        [
+            ("Square", "Square"),
+            ("Square", "Inn"),
+            ("Square", "Mill"),
+            ("Square", "Chapel"),
+            ("Square", "Ghost Town"),
+            ("Mill", "Forge"),
+        ]
+    )
+    agent = Agent("Toblen", "Owns a trading post.", "Square", world_graph, None)
+    agent.plans = "Sell some bread."
+    return agent
+
+
+def _names(candidates):
+    """Return the names of the candidate locations."""
+    return [location.name for location in candidates]
+
+
+def test_candidates_within_hops(agent, locations):
+    """Check that no location beyond the hop cutoff is shortlisted."""
+    assert _names(agent.candidate_locations(locations, {}, 1, hops=0)) == ["Square"]
+
+    candidates = _names(agent.candidate_locations(locations, {}, 1, hops=1))
+    assert set(candidates) == {"Square", "Inn", "Mill", "Chapel"}
+
+    candidates = _names(agent.candidate_locations(locations, {}, 1, hops=2))
+    assert "Forge" in candidates
+
+
+def test_candidates_are_truncated(agent, locations):
+    """Check that at most num_candidates locations are shortlisted."""
+    candidates = agent.candidate_locations(locations, {}, 1, num_candidates=2)
+    assert len(candidates) == 2
+    assert candidates[0].name == "Square"
+
+
+def test_candidates_skip_unknown_locations(agent, locations):
+    """Check that graph nodes without a Location are skipped."""
+    candidates = _names(agent.candidate_locations(locations, {}, 1, hops=2))
+    assert "Ghost Town" not in candidates
+    assert len(candidates) == 5
+
+
+def test_candidates_follow_plans(agent, locations):
+    """Check that locations matching the plans come first, even further away."""
+    agent.plans = "Visit the smithy to buy swords."
+    candidates = _names(agent.candidate_locations(locations, {}, 1, hops=2))
+    assert candidates[0] == "Forge"
+
+
+def test_candidates_follow_popularity(agent, locations):
+    """Check that more popular locations come first."""
+    popularity = {"Square": 1, "Chapel": 9}
+    candidates = _names(agent.candidate_locations(locations, popularity, 10))
+    assert candidates[:2] == ["Chapel", "Square"]
+
+
+def test_choose_location_is_seeded(agent):
+    """Check that the same seed gives the same choices."""
+    place_ratings = [("Inn", 3, ""), ("Mill", 3, ""), ("Chapel", 2, "")]
+
+    def choices(seed):
+        rng = random.Random(seed)
+        return [agent.choose_location(place_ratings, rng) for _ in range(20)]
+
+    assert choices(7) == choices(7)
+    assert set(choices(7)) <= {"Inn", "Mill", "Chapel"}
+
+
+def test_choose_location_prefers_high_ratings(agent):
+    """Check that the softmax favours higher ratings."""
+    place_ratings = [("Inn", 5, ""), ("Mill", 1, "")]
+    rng = random.Random(0)
+    choices = [agent.choose_location(place_ratings, rng) for _ in range(200)]
+    assert choices.count("Inn") > 150
+
+
+def test_choose_location_without_ratings(agent):
+    """Check that the agent stays when there is nothing to choose from."""
+    assert agent.choose_location([], random.Random(0)) == "Square"
@@ -0,0 +1,56 @@
+"""Tests for the LLM engine routes and call statistics."""
+import pytest
+
+from generativedm.llm_engine import LLMEngine, RouteStats
+
+
+def test_route():
+    """Check that routed call types use their models in order."""
+    llm_engine = LLMEngine(
+        model_engine="default", routes={"rate_locations": ["small", "openai"]}
+    )
+
+    engines = llm_engine.route("rate_locations")
+    assert [engine.model_engine for engine in engines] == ["small", "text-davinci-002"]
+    assert [engine.use_openai for engine in engines] == [False, True]
+    assert llm_engine.route("plan") == [llm_engine]
+
+
+def test_unknown_call_type():
+    """Check that routes for unknown call types are rejected."""
+    with pytest.raises(ValueError):
+        LLMEngine(routes={"foo": ["small"]})
+
+
+def test_record():
+    """Check that calls, escalations and latencies are accumulated."""
+    llm_engine = LLMEngine()
+    llm_engine.record("rate_memories", 0.5, escalated=True)
+    llm_engine.record("rate_memories", 0.1, escalated=False)
+
+    stats = llm_engine.stats["rate_memories"]
+    assert stats.calls == 2
+    assert stats.escalations == 1
+    assert stats.mean_latency == pytest.approx(0.3)
+    assert stats.escalation_rate == 0.5
+
+
+def test_empty_stats():
+    """Check that statistics without calls do not divide by zero."""
+    assert RouteStats().mean_latency == 0.0
+    assert RouteStats().escalation_rate == 0.0
+
+
+def test_report():
+    """Check that the report has one line per call type."""
+    llm_engine = LLMEngine(
+        model_engine="default", routes={"rate_memories": ["small", "large"]}
+    )
+    llm_engine.record("rate_memories", 0.5, escalated=True)
+    llm_engine.record("rate_memories", 0.1, escalated=False)
+    llm_engine.record("plan", 2.0, escalated=False)
+
+    assert llm_engine.report().splitlines() == [
+        "rate_memories [small -> large]: 2 calls, 0.30s mean latency, 50% escalated",
+        "plan [default]: 1 calls, 2.00s mean latency, 0% escalated",
+    ]
@@ -0,0 +1,46 @@
+"""Tests for loading world configurations."""
+import json
+
+import pytest
+
+from generativedm.simulate import load_world
+
+
+def _config(tmp_path, **town_data):
+    """Write a world configuration with three areas and return its path."""
+    town_data = {
+        "town_areas": {"Inn": "An inn.", "Square": "A square.", "Mill": "A mill."},
+        "town_people": {"Toblen": {"description": "", "starting_location": "Inn"}},
+        **town_data,
+    }
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps(town_data))
+    return str(config_file)
+
+
+def test_default_ring(tmp_path):
+    """Check that areas are connected in a ring without a town_graph."""
+    _, _, world_graph = load_world(_config(tmp_path))
+    assert world_graph.has_edge("Inn", "Square")
+    assert world_graph.has_edge("Square", "Mill")
+    assert world_graph.has_edge("Mill", "Inn")
+    assert world_graph.has_edge("Inn", "Inn")
+
+
+def test_town_graph(tmp_path):
+    """Check that the town_graph replaces the default ring."""
+    _, _, world_graph = load_world(
+        _config(tmp_path, town_graph=[["Inn", "Square"], ["Square", "Mill"]])
+    )
+    assert world_graph.has_edge("Inn", "Square")
+    assert not world_graph.has_edge("Mill", "Inn")
+    assert set(world_graph.nodes) == {"Inn", "Square", "Mill"}
+
+
+@pytest.mark.parametrize(
+    "edge", [["Inn", "Squire"], ["Inn"], ["Inn", "Mill", "Square"]]
+)
+def test_invalid_town_graph(tmp_path, edge):
+    """Check that edges to unknown areas are rejected."""
+    with pytest.raises(ValueError, match="town_graph"):
+        load_world(_config(tmp_path, town_graph=[edge]))
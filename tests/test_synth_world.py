@@ -0,0 +1,81 @@
+"""Tests for the synthetic world generator."""
+import io
+import json
+import re
+
+import networkx as nx
+import pytest
+
+from generativedm.synth_world import DISTRIBUTIONS, TOPOLOGIES, write_world
+
+NUM_AREAS = [1, 2, 3, 5, 17, 100]
+
+
+def _world(num_areas, topology="ring", distribution="uniform", seed=0, num_agents=50):
+    """Generate a world and return it as text."""
+    stream = io.StringIO()
+    write_world(
+        stream,
+        num_agents=num_agents,
+        num_areas=num_areas,
+        topology=topology,
+        distribution=distribution,
+        seed=seed,
+    )
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("num_areas", NUM_AREAS)
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+@pytest.mark.parametrize("topology", TOPOLOGIES)
+def test_world_is_valid(topology, distribution, num_areas):
+    """Check that the world parses and only references known areas."""
+    world = json.loads(_world(num_areas, topology, distribution))
+
+    assert len(world["town_areas"]) == num_areas
+    assert len(world["town_people"]) == 50
+    for edge in world["town_graph"]:
+        assert len(edge) == 2
+        assert all(area in world["town_areas"] for area in edge)
+    for person in world["town_people"].values():
+        assert person["starting_location"] in world["town_areas"]
+
+
+@pytest.mark.parametrize("num_areas", NUM_AREAS)
+@pytest.mark.parametrize("topology", TOPOLOGIES)
+def test_world_graph_is_connected(topology, num_areas):
+    """Check that every area can be reached from every other area."""
+    world = json.loads(_world(num_areas, topology))
+
+    world_graph = nx.Graph()
+    world_graph.add_nodes_from(world["town_areas"])
+    world_graph.add_edges_from(world["town_graph"])
+    assert nx.is_connected(world_graph)
+
+
+@pytest.mark.parametrize("topology", TOPOLOGIES)
+def test_world_is_seeded(topology):
+    """Check that the same seed gives the same world."""
+    assert _world(17, topology, "zipf", seed=3) == _world(17, topology, "zipf", seed=3)
+    assert _world(17, topology, "zipf", seed=3) != _world(17, topology, "zipf", seed=4)
+
+
+def test_world_without_agents():
+    """Check that a world without people is still valid."""
+    world = json.loads(_world(5, num_agents=0))
+    assert world["town_people"] == {}
+
+
+def test_world_without_areas():
+    """Check that a world needs at least one area."""
+    with pytest.raises(ValueError):
+        _world(0)
+
+
+
+def test_person_description_article():
+    """Check that descriptions use the right indefinite article."""
+    world = json.loads(_world(5, num_agents=200))
+    for person in world["town_people"].values():
+        article, trait = re.search(r" is (an?) (\w+)", person["description"]).groups()
+        assert (article == "an") == (trait[0] in "aeiou")
@@ -0,0 +1,141 @@
+"""Tests for the rating parsers and the model cascade."""
+import pytest
+
+from generativedm.llm_engine import LLMEngine
+from generativedm.pkg_utils import text_generation
+from generativedm.pkg_utils.text_generation import (
+    generate,
+    generate_rating,
+    get_confident_rating,
+    get_lenient_rating,
+    get_rating,
+)
+
+
+@pytest.mark.parametrize(
+    "answer, rating",
+    [
+        ("4", 4),
+        ("Rating: 4", 4),
+        ("Rating: 4/5", 4),
+        ("4 / 5", 4),
+        ("4 out of 5", 4),
+        ("4 of 5", 4),
+        ("I would give it a 2 Out Of 5.", 2),
+        ("3. I care about this, 3 out of 5.", 3),
+        ("1-5 scale: 4", 4),
+        ("On a scale from 1 to 5: 2", 2),
+        ("Between 1 and 5, I'd say 4", 4),
+    ],
+)
+def test_confident_rating(answer, rating):
+    """Check that unambiguous answers are accepted."""
+    assert get_confident_rating(answer) == rating
+
+
+@pytest.mark.parametrize(
+    "answer",
+    ["Very likely", "", "80%", "0", "6/10", "Either 2 or 4", "2 or 4 out of 5"],
+)
+def test_low_confidence_rating(answer):
+    """Check that missing, out of range or ambiguous answers are rejected."""
+    assert get_confident_rating(answer) is None
+
+
+@pytest.mark.parametrize(
+    "answer, rating",
+    [
+        ("Either 2 or 4", 2),
+        ("Between 1 and 5, maybe 4 or 3", 4),
+        ("80%, so 4", 4),
+        ("80%", None),
+        ("Very likely", None),
+    ],
+)
+def test_lenient_rating(answer, rating):
+    """Check that the fallback parser takes the first rating within range."""
+    assert get_lenient_rating(answer) == rating
+
+
+def test_rating():
+    """Check that the original parser takes the smallest number."""
+    assert get_rating("Between 2 and 4") == 2
+    assert get_rating("Very likely") is None
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Answer each prompt from a per-model table and record the models called."""
+    table = {}
+    called = []
+
+    def complete(prompt, llm_engine):
+        called.append(llm_engine.model_engine)
+        return table[llm_engine.model_engine]
+
+    monkeypatch.setattr(text_generation, "complete", complete)
+    return table, called
+
+
+@pytest.fixture
+def llm_engine():
+    """Route ratings and actions from a small to a large model."""
+    return LLMEngine(
+        model_engine="default",
+        routes={"rate_memories": ["small", "large"], "action": ["small", "large"]},
+    )
+
+
+def test_rating_stops_at_small_model(answers, llm_engine):
+    """Check that a confident answer from the small model is not escalated."""
+    table, called = answers
+    table.update({"small": "4 out of 5", "large": "2"})
+
+    assert generate_rating("prompt", llm_engine, "rate_memories") == ("4 out of 5", 4)
+    assert called == ["small"]
+    assert llm_engine.stats["rate_memories"].calls == 1
+    assert llm_engine.stats["rate_memories"].escalations == 0
+
+
+def test_rating_escalates_to_large_model(answers, llm_engine):
+    """Check that a low confidence answer is escalated."""
+    table, called = answers
+    table.update({"small": "Very likely", "large": "2"})
+
+    assert generate_rating("prompt", llm_engine, "rate_memories") == ("2", 2)
+    assert called == ["small", "large"]
+    assert llm_engine.stats["rate_memories"].escalations == 1
+
+
+def test_rating_falls_back_when_all_models_fail(answers, llm_engine):
+    """Check that the last answer is parsed leniently, ignoring out of range numbers."""
+    table, _ = answers
+    table.update({"small": "Very likely", "large": "80%"})
+    assert generate_rating("prompt", llm_engine, "rate_memories") == ("80%", None)
+
+    table["large"] = "Either 2 or 3"
+    assert generate_rating("prompt", llm_engine, "rate_memories") == (
+        "Either 2 or 3",
+        2,
+    )
+    assert llm_engine.stats["rate_memories"].escalation_rate == 1.0
+
+
+def test_generate_escalates_on_empty_answer(answers, llm_engine):
+    """Check that an empty text answer is escalated."""
+    table, called = answers
+    table.update({"small": "", "large": "Walk to the inn."})
+
+    assert generate("prompt", llm_engine, "action") == "Walk to the inn."
+    assert called == ["small", "large"]
+
+
+def test_unrouted_call_uses_default_engine(answers, llm_engine):
+    """Check that call types without a route use the engine itself."""
+    table, called = answers
+    table["default"] = "Open the shop."
+
+    assert generate("prompt", llm_engine, "plan") == "Open the shop."
+    assert called == ["default"]
+    assert llm_engine.stats["plan"].calls == 1
+    assert llm_engine.stats["plan"].escalations == 0